@@ -1,12 +1,39 @@
 import os
-import re
-import xml.etree.ElementTree as ET
-from copy import deepcopy
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree as ET
 
 # For file dialogs
 import tkinter as tk
 from tkinter.filedialog import askopenfilename
 
+# Bytes read from the export per parser feed
+_READ_CHUNK_SIZE = 64 * 1024
+
+# IDODefinitions with one of these <AccessAs> values ship with SyteLine and are not exported
+_SKIPPED_ACCESS_AS = frozenset({"BaseSyteLine", "Core"})
+
+# Number of files handed to a writer thread per queue entry
+_WRITE_BATCH_SIZE = 64
+
+# Initial size of each writer thread's file buffer; it grows to fit larger files
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+# Every split file starts with the same declaration, so it is written as a constant
+_XML_DECLARATION = b'<?xml version="1.0" encoding="utf-8"?>\n'
+
+# os.open() flags for the split files; O_BINARY stops Windows from translating newlines
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# str.translate table for the ASCII range: every character not allowed in
+# Windows file names maps to '_'. Characters past the end of the table are
+# left unchanged. A flat string indexes faster than a maketrans() dict.
+_INVALID_FILENAME_CHARS = "".join(
+    '_' if chr(code) in '\\/*?:"<>|' else chr(code) for code in range(128)
+)
+
 def get_input_file():
     """
     Pops up a file dialog prompting the user to select the SyteLine export XML.
@@ -21,80 +48,375 @@ def get_input_file():
     # If the user cancels, file_path will be ""
     return file_path if file_path else None
 
+def _discard(element):
+    """
+    Frees a fully processed element and detaches it from its parent, so the
+    partially built tree never holds more than the item currently being parsed.
+    """
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        parent.remove(element)
+
+def _wrapper_bytes(top_level_tag, top_level_attrib, container_tag, container_attrib):
+    """
+    Serializes the <Top ...><Container ...> wrapper that every split file shares and
+    returns it as (prefix, suffix) bytes, so an item's own bytes can be written
+    between the two halves.
+    """
+    wrapper = ET.Element(top_level_tag, top_level_attrib)
+    container = ET.SubElement(wrapper, container_tag, container_attrib)
+    # Placeholder marking where the item goes
+    ET.SubElement(container, "ItemPlaceholder")
+
+    prefix, suffix = ET.tostring(
+        wrapper, xml_declaration=False, encoding="utf-8"
+    ).split(b"<ItemPlaceholder/>")
+    return _XML_DECLARATION + prefix, suffix
+
+def _write_files(
+    write_queue: queue.Queue,
+    latest_jobs: dict,
+    path_locks: list,
+    log: deque = None
+):
+    """
+    Writer thread loop: takes batches of (path, path key, sequence, prefix, body,
+    suffix) jobs off the queue and writes each file until it receives None. Every
+    file is copied into one preallocated buffer that this thread reuses (it only
+    ever grows) and written with raw os.write() calls. After the first failure the
+    remaining batches are still drained (so the producer never blocks) and the
+    error is re-raised.
+
+    Several items can map to the same file (duplicate or sanitized names, case on
+    Windows). Like a sequential run, the last one must win: a file is written under
+    its path's lock, and only if its job is still the latest queued for that path
+    (`latest_jobs` maps path key -> sequence); older jobs are dropped.
+
+    Returns the number of files written. If `log` is given, a "Created: ..." line
+    is appended to it per file instead of printing from every thread.
+    """
+    error = None
+    written = 0
+    buffer = bytearray(_WRITE_BUFFER_SIZE)
+    while True:
+        batch = write_queue.get()
+        if batch is None:
+            break
+        if error is not None:
+            continue
+
+        for output_file_path, path_key, sequence, prefix, body, suffix in batch:
+            with path_locks[hash(path_key) % len(path_locks)]:
+                if latest_jobs[path_key] != sequence:
+                    # A later item with the same file name is queued; it wins
+                    continue
+
+                size = len(prefix) + len(body) + len(suffix)
+                if size > len(buffer):
+                    buffer = bytearray(size)
+
+                # Same-length slice assignments copy in place without resizing
+                body_start = len(prefix)
+                suffix_start = body_start + len(body)
+                buffer[:body_start] = prefix
+                buffer[body_start:suffix_start] = body
+                buffer[suffix_start:size] = suffix
+
+                try:
+                    # 0o666 (minus umask) matches what open() creates
+                    fd = os.open(output_file_path, _OPEN_FLAGS, 0o666)
+                    try:
+                        with memoryview(buffer) as view:
+                            offset = 0
+                            while offset < size:
+                                offset += os.write(fd, view[offset:size])
+                    finally:
+                        os.close(fd)
+                except OSError as exc:
+                    error = exc
+                    break
+
+            written += 1
+            if log is not None:
+                log.append(f"Created: {output_file_path}")
+
+    if error is not None:
+        raise error
+    return written
+
+def _iter_parse_events(input_file: str, tags):
+    """
+    Yields ("start" | "end", element) events for the export, feeding the file
+    to an XMLPullParser in fixed-size chunks so parsing overlaps with reading.
+    Only elements named in `tags` produce events; the filtering happens inside
+    lxml, so the many elements nested in each item never reach Python.
+
+    Unreported elements are still built into the tree, so after each chunk every
+    finished top-level section, and every finished child of the section being
+    read, is dropped. The tree never holds more than the current section's
+    in-progress child (e.g. the item being parsed) plus one chunk of input.
+
+    Only entities declared inside the document are expanded; external entities
+    are never loaded, since the export is a user-picked file.
+    """
+    parser_options = dict(collect_ids=False, huge_tree=True, resolve_entities="internal")
+
+    # The top-level tag is reported too, so its element is known from the very
+    # first event and finished sections can be pruned from it
+    for _, first_element in ET.iterparse(input_file, events=("start",), **parser_options):
+        tags = set(tags) | {first_element.tag}
+        break
+
+    top_level = None
+
+    parser = ET.XMLPullParser(events=("start", "end"), tag=tags, **parser_options)
+    with open(input_file, "rb") as source:
+        for chunk in iter(lambda: source.read(_READ_CHUNK_SIZE), b""):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if top_level is None:
+                    top_level = element
+                yield event, element
+
+            # Everything except the last child at each of these two levels is
+            # finished, and its events have all been handled above
+            if top_level is not None and len(top_level):
+                del top_level[:-1]
+                del top_level[0][:-1]
+
+    parser.close()
+    yield from parser.read_events()
+
+def _extract_items(
+    input_file: str,
+    output_directories: dict,
+    containers_found: set,
+    items_found: dict,
+    write_queue: queue.Queue,
+    latest_jobs: dict,
+    log: deque = None
+):
+    """
+    Streams the export (see `_iter_parse_events`) and serializes every requested item as
+    soon as its closing tag is read; each item is discarded right after. Together
+    with the pruning done while parsing, memory use stays roughly one item plus one
+    read chunk instead of the whole document.
+
+    Only the first occurrence of each container is split. Once every requested
+    container has been read the rest of the file is not parsed at all.
+
+    :param input_file:         Path to the large SyteLine export XML.
+    :param output_directories: Container tag -> {item tag: output directory ending in a separator}.
+    :param containers_found:   Set that receives every requested container tag present.
+    :param items_found:        Item tag -> count, incremented for every matching item.
+    :param write_queue:        Queue that receives lists of (path, path key, sequence, prefix, body,
+                               suffix) jobs, one per file.
+    :param latest_jobs:        Dict updated with path key -> sequence of the newest job per file.
+    :param log:                Optional deque that receives a line per skipped item.
+    """
+
+    # Only container and item elements are reported by the parser
+    tags = set(output_directories)
+    for item_directories in output_directories.values():
+        tags.update(item_directories)
+
+    container = None
+    container_tag = None
+    prefix = None
+    suffix = None
+    item_directories = None
+    check_access_as = False
+
+    # Requested containers not read yet; parsing stops when this is empty
+    containers_left = set(output_directories)
+
+    # Files are queued in batches so the queue's locking is paid once per batch
+    batch = []
+
+    # Increases with every queued file, so later items for a path can be told apart
+    sequence = 0
+
+    # Local aliases for the names used once per item, so the loop below reads
+    # fast locals instead of doing global/attribute lookups every iteration
+    tostring = ET.tostring
+    normcase = os.path.normcase
+    discard = _discard
+    invalid_filename_chars = _INVALID_FILENAME_CHARS
+    skipped_access_as = _SKIPPED_ACCESS_AS
+    batch_size = _WRITE_BATCH_SIZE
+
+    for event, element in _iter_parse_events(input_file, tags):
+        if event == "start":
+            top_level = element.getparent()
+            if (
+                element.tag in containers_left
+                and top_level is not None
+                and top_level.getparent() is None
+            ):
+                # A requested container directly under the top-level element
+                # (e.g. <FormsAndObjectsExport Version="010000">)
+                container = element
+                container_tag = element.tag
+                item_directories = output_directories[container_tag]
+                containers_found.add(container_tag)
+
+                # Only IDODefinitions are filtered on <AccessAs>; decide once per container
+                check_access_as = container_tag == "IDODefinitions"
+
+                # Every file from this container shares the same wrapper
+                # (attributes copied from e.g. <Forms Type="1">), so serialize it once
+                prefix, suffix = _wrapper_bytes(
+                    top_level.tag, dict(top_level.attrib), container_tag, dict(element.attrib)
+                )
+            continue
+
+        if element is container:
+            # The container has been fully read
+            containers_left.discard(container_tag)
+            container = None
+            container_tag = None
+            discard(element)
+            if not containers_left:
+                break
+            continue
+
+        if container is None or element.getparent() is not container:
+            # A requested tag nested inside something else; it is freed with its ancestor
+            continue
+
+        if element.tag in item_directories:
+            item_tag = element.tag
+            output_directory = item_directories[item_tag]
+            items_found[item_tag] += 1
+            if items_found[item_tag] == 1:
+                os.makedirs(output_directory, exist_ok=True)
+
+            item_name = element.attrib.get("Name", "UnnamedItem")
+
+            # If this is an IDODefinition, skip if <AccessAs> is "BaseSyteLine" or "Core".
+            # A plain walk over the direct children avoids find()'s path handling.
+            skip = False
+            if check_access_as:
+                for child in element:
+                    if child.tag == "AccessAs":
+                        value = (child.text or "").strip()
+                        break
+                else:
+                    value = ""
+                if value in skipped_access_as:
+                    if log is not None:
+                        log.append(f"Skipping IDO Name='{item_name}' because AccessAs={value}.")
+                    skip = True
+
+            if not skip:
+                # Replace invalid filename characters with '_'
+                safe_item_name = item_name.translate(invalid_filename_chars)
+
+                # Construct the output file path
+                output_file_path = f"{output_directory}{safe_item_name}.xml"
+
+                # Queue the serialized item with the wrapper halves; the writer
+                # thread splices them together
+                body = tostring(element, xml_declaration=False, encoding="utf-8", with_tail=False)
+                path_key = normcase(output_file_path)
+                sequence += 1
+                latest_jobs[path_key] = sequence
+                batch.append((output_file_path, path_key, sequence, prefix, body, suffix))
+                if len(batch) == batch_size:
+                    write_queue.put(batch)
+                    batch = []
+
+        # Every direct child of the container is dropped once handled
+        discard(element)
+
+    if batch:
+        write_queue.put(batch)
+
 def split_syteline_objects(
-    tree: ET.ElementTree,
+    input_file: str,
     base_output_directory: str,
-    items_to_extract: dict
+    items_to_extract: dict,
+    verbose: bool = False
 ):
     """
-    Splits a SyteLine export XML (already parsed as `tree`) into separate XML files
-    for each item type.
+    Splits a SyteLine export XML into separate XML files for each item type.
 
-    :param tree:                 An ElementTree object parsed from the large export file.
+    The export is streamed (see `_extract_items`) and the serialized items are
+    handed to a pool of writer threads through a bounded queue, so disk writes
+    overlap with parsing.
+
+    :param input_file:           Path to the large SyteLine export XML.
     :param base_output_directory:Directory where we create subfolders & write individual XMLs.
     :param items_to_extract:     A dictionary mapping singular item tags -> plural container tags.
                                  Example: {"Form": "Forms", "IDODefinition": "IDODefinitions", ...}
+    :param verbose:              If True, also list every created file and skipped IDO,
+                                 printed in one write after all files are done.
     """
 
-    root = tree.getroot()
+    # Group the requested items by container in one pass, so each parsed tag is
+    # matched with a single dict lookup. Several item types may share a container.
+    # Directories keep a trailing separator so file paths are a plain concatenation.
+    # e.g. {"Forms": {"Form": "Bulk Customization Export/Form/"}, ...}
+    output_directories = {}
+    for item_tag, container_tag in items_to_extract.items():
+        output_directories.setdefault(container_tag, {})[item_tag] = os.path.join(
+            base_output_directory, f"{item_tag}", ""
+        )
 
-    # The top-level element (e.g. <FormsAndObjectsExport ...>) 
-    # and its attributes (e.g. {"Version": "010000"})
-    top_level_tag = root.tag
-    top_level_attrib = dict(root.attrib)
+    # Containers present in the export, and number of matching items per item tag
+    containers_found = set()
+    items_found = dict.fromkeys(items_to_extract, 0)
 
     # Ensure the base output directory exists
     os.makedirs(base_output_directory, exist_ok=True)
 
-    # For each item type, find and process the container tag
-    for item_tag, container_tag in items_to_extract.items():
-        container_element = root.find(container_tag)
-        if container_element is None:
-            print(f"No <{container_tag}> element found for item '{item_tag}'. Skipping.")
-            continue
+    # Per-item messages are collected (deque appends are thread-safe) rather than
+    # printed from the writer threads one line at a time
+    log = deque() if verbose else None
 
-        items = container_element.findall(item_tag)
-        if not items:
-            print(f"No <{item_tag}> elements found inside <{container_tag}>. Skipping.")
-            continue
-
-        # Create a subdirectory for this item type
-        # e.g. "Bulk Customization Export/Bulk Customization Form Export"
-        subdirectory_name = f"{item_tag}"
-        output_directory = os.path.join(base_output_directory, subdirectory_name)
-        os.makedirs(output_directory, exist_ok=True)
-
-        # Copy attributes from container (like <Forms Type="1">)
-        container_attrib = dict(container_element.attrib)
-
-        for item in items:
-            item_name = item.attrib.get("Name", "UnnamedItem")
+    # Writing thousands of small files is I/O bound; file writes release the GIL
+    worker_count = (os.cpu_count() or 1) * 2
+    # Bound the queue in files rather than entries: each entry is a whole batch,
+    # so allow about 4 waiting files per writer, but never fewer than 2 batches
+    write_queue = queue.Queue(maxsize=max(2, worker_count * 4 // _WRITE_BATCH_SIZE))
 
-            # If this is an IDODefinition, skip if <AccessAs> is "BaseSyteLine" or "Core"
-            if container_tag == "IDODefinitions":
-                access_as_el = item.find("AccessAs")
-                if access_as_el is not None and access_as_el.text:
-                    value = access_as_el.text.strip()
-                    if value in {"BaseSyteLine", "Core"}:
-                        print(f"Skipping IDO Name='{item_name}' because AccessAs={value}.")
-                        continue
+    # Writes to the same file are serialized through one of these locks
+    latest_jobs = {}
+    path_locks = [threading.Lock() for _ in range(worker_count * 4)]
 
-            # Replace invalid filename characters with '_'
-            safe_item_name = re.sub(r'[\\/*?:"<>|]', '_', item_name)
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        writers = [
+            executor.submit(_write_files, write_queue, latest_jobs, path_locks, log)
+            for _ in range(worker_count)
+        ]
+        try:
+            _extract_items(
+                input_file,
+                output_directories,
+                containers_found,
+                items_found,
+                write_queue,
+                latest_jobs,
+                log
+            )
+        finally:
+            # One stop marker per writer thread
+            for _ in writers:
+                write_queue.put(None)
 
-            # Build a new minimal XML structure
-            new_root = ET.Element(top_level_tag, top_level_attrib)
-            new_container = ET.SubElement(new_root, container_tag, container_attrib)
-            new_container.append(deepcopy(item))
+        files_created = sum(writer.result() for writer in writers)
 
-            # Construct the output file path
-            output_file_path = os.path.join(output_directory, f"{safe_item_name}.xml")
+    if log:
+        print("\n".join(log))
 
-            # Write out the file
-            new_tree = ET.ElementTree(new_root)
-            new_tree.write(output_file_path, xml_declaration=True, encoding="utf-8")
+    for item_tag, container_tag in items_to_extract.items():
+        if container_tag not in containers_found:
+            print(f"No <{container_tag}> element found for item '{item_tag}'. Skipping.")
+        elif not items_found[item_tag]:
+            print(f"No <{item_tag}> elements found inside <{container_tag}>. Skipping.")
 
-            print(f"Created: {output_file_path}")
+    print(f"Created {files_created} files in {base_output_directory}")
 
 
 if __name__ == "__main__":
@@ -122,12 +444,9 @@ if __name__ == "__main__":
         "IDODefinition": "IDODefinitions"
     }
 
-    # Parse the selected input file
-    full_tree = ET.parse(input_file)
-
     # Split out each object type
     split_syteline_objects(
-        tree=full_tree,
+        input_file=input_file,
         base_output_directory=base_output_dir,
         items_to_extract=items_map
     )